@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shared helper to download the loldrivers.io driver list, cached on disk
+and revalidated with a conditional GET.
+"""
+import os
+import requests
+from _jsonio import loads, dumps, read_json
+
+LOLDIVERS_URL = "https://www.loldrivers.io/api/drivers.json"
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "data", "jsons")
+CACHE_PATH = os.path.join(CACHE_DIR, "loldrivers_cache.json")
+CACHE_HEADERS_PATH = os.path.join(CACHE_DIR, "loldrivers_cache.headers.json")
+REQUEST_TIMEOUT = 30
+
+# Pooled keep-alive connection shared by every fetch in the process
+_session = requests.Session()
+_session.headers.update({"User-Agent": "byovd-watchdog/1"})
+
+
+def _load_cached_headers():
+    if not os.path.exists(CACHE_PATH):
+        return {}
+    try:
+        cached_headers = read_json(CACHE_HEADERS_PATH)
+    except (OSError, ValueError):
+        return {}
+    # A sidecar that is valid JSON but not an object is as good as missing
+    return cached_headers if isinstance(cached_headers, dict) else {}
+
+
+def _write_atomic(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def fetch_loldrivers():
+    """Return the parsed drivers.json, reusing the cached copy on a 304."""
+    cached_headers = _load_cached_headers()
+    request_headers = {}
+    if cached_headers.get("ETag"):
+        request_headers["If-None-Match"] = cached_headers["ETag"]
+    if cached_headers.get("Last-Modified"):
+        request_headers["If-Modified-Since"] = cached_headers["Last-Modified"]
+
+    resp = _session.get(LOLDIVERS_URL, headers=request_headers, timeout=REQUEST_TIMEOUT)
+    if resp.status_code == 304:
+        try:
+            return read_json(CACHE_PATH)
+        except (OSError, ValueError):
+            # Cache vanished or is corrupt, fetch the full body again
+            resp = _session.get(LOLDIVERS_URL, timeout=REQUEST_TIMEOUT)
+
+    resp.raise_for_status()
+    body = resp.content
+    data = loads(body)
+
+    if os.path.isdir(CACHE_DIR):
+        _write_atomic(CACHE_PATH, body)
+        _write_atomic(CACHE_HEADERS_PATH, dumps({
+            "ETag": resp.headers.get("ETag"),
+            "Last-Modified": resp.headers.get("Last-Modified")
+        }))
+
+    return data
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shared JSON helpers, backed by orjson when it is installed and falling back
+to the stdlib json module otherwise. Output matches
+json.dump(indent=2, ensure_ascii=False) byte for byte.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj):
+    """Serialize obj to UTF-8 encoded, 2-space indented JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def read_json(path):
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def write_json(path, obj):
+    with open(path, "wb") as f:
+        f.write(dumps(obj))
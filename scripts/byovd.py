@@ -11,19 +11,33 @@
 # URL: https://github.com/ghostbyt3/BYOVDFinder
 
 import argparse
-import requests
-import json
+import re
+from functools import lru_cache
 from colorama import init, Fore, Back, Style
-import xml.etree.ElementTree as ET
+import lxml.etree as ET
 from packaging import version
+from _http import fetch_loldrivers
+from _jsonio import dumps
 
 init(autoreset=True)
 
-LOLDIVERS_URL = "https://www.loldrivers.io/api/drivers.json"
+SIPOLICY_NS = "urn:schemas-microsoft-com:sipolicy"
+DENY_TAG = f"{{{SIPOLICY_NS}}}Deny"
+FILE_ATTRIB_TAG = f"{{{SIPOLICY_NS}}}FileAttrib"
+SIGNER_TAG = f"{{{SIPOLICY_NS}}}Signer"
+CERT_ROOT_TAG = f"{{{SIPOLICY_NS}}}CertRoot"
+FILE_ATTRIB_REF_TAG = f"{{{SIPOLICY_NS}}}FileAttribRef"
+
+# TBS hash types that SiPolicy CertRoot values may match
+CERT_HASH_TYPES = frozenset(('MD5', 'SHA1', 'SHA256', 'SHA384'))
+
+# Many loldrivers samples share the same FileVersion string
+parse_version = lru_cache(maxsize=4096)(version.parse)
+
+DOTTED_INT_VERSION_RE = re.compile(r"\d+(?:\.\d+)*", re.ASCII)
 
 def load_loldrivers():
-    response = requests.get(LOLDIVERS_URL)
-    data = response.json()
+    data = fetch_loldrivers()
     known_vulnerable_samples = []
     
     for entry in data:
@@ -33,180 +47,236 @@ def load_loldrivers():
                     'Id': entry.get('Id'),
                     'Tags': entry.get('Tags', [])
                 }
+
+                # Normalize once here instead of in every predicate
+                hashes = set()
+                auth_hash = sample.get('Authentihash') or {}
+                for hash_type in ('MD5', 'SHA1', 'SHA256'):
+                    for h in (sample.get(hash_type), auth_hash.get(hash_type)):
+                        if h:
+                            hashes.add(h.lower())
+                sample['_hashes_lower'] = frozenset(hashes)
+                sample['_orig_fn_lower'] = (sample.get('OriginalFilename') or '').lower()
+
+                # Flatten the TBS hashes of every signing certificate
+                cert_hashes = set()
+                for sig in sample.get('Signatures') or []:
+                    for cert in sig.get('Certificates') or []:
+                        tbs = cert.get('TBS')
+                        if not tbs:
+                            continue
+                        for hash_type, h in tbs.items():
+                            if h and hash_type in CERT_HASH_TYPES:
+                                cert_hashes.add(h.lower())
+                sample['_cert_hashes'] = frozenset(cert_hashes)
                 known_vulnerable_samples.append(sample)
     
     return known_vulnerable_samples
 
-def load_policy(xml_path):
-    namespaces = {'ns': 'urn:schemas-microsoft-com:sipolicy'}
-    tree = ET.parse(xml_path)
-    root = tree.getroot()
-
-    file_rules = root.find("ns:FileRules", namespaces)
-    signers = root.find("ns:Signers", namespaces)
+def fast_version(version_string):
+    """Return a comparable tuple for plain A.B.C.D versions, else None.
+    
+    Trailing zeros are dropped so comparisons match packaging.version,
+    which treats 1.2 and 1.2.0.0 as equal.
+    """
+    if not DOTTED_INT_VERSION_RE.fullmatch(version_string):
+        return None
+    
+    parts = [int(part) for part in version_string.split('.')]
+    while len(parts) > 1 and parts[-1] == 0:
+        parts.pop()
+    return tuple(parts)
 
-    # Collect deny rules (hash and file version based)
+def load_policy(xml_path):
     deny_hashes = set()
     deny_file_versions = {}
-    if file_rules is not None:
-        for rule in file_rules.findall("ns:Deny", namespaces):
-            hash_value = rule.get("Hash", "").lower()
+    cert_index = {}
+    file_attribs = {}
+
+    # Stream the policy and only materialize the elements we care about.
+    # Each one is cleared once processed and already-handled siblings are
+    # detached from the parent, so the partial tree stays small. Attributes are
+    # read without a default so missing ones skip the lower() entirely.
+    context = ET.iterparse(xml_path, events=("end",),
+                           tag=(DENY_TAG, FILE_ATTRIB_TAG, SIGNER_TAG))
+    for _, elem in context:
+        tag = elem.tag
+        if tag == DENY_TAG:
+            # Collect deny rules (hash and file version based)
+            hash_value = elem.get("Hash")
             if hash_value:
-                deny_hashes.add(hash_value)
-            
-            file_name = rule.get("FileName", "")
-            max_version = rule.get("MaximumFileVersion", "")
-            if file_name and max_version:
-                deny_file_versions[file_name.lower()] = max_version
+                deny_hashes.add(hash_value.lower())
 
-    # Collect signer information with file attrib refs
-    signer_info = []
-    if signers is not None:
-        for signer in signers.findall("ns:Signer", namespaces):
-            cert_roots = []
-            for cert in signer.findall("ns:CertRoot", namespaces):
-                cert_value = cert.get("Value", "").lower()
-                if cert_value:
-                    cert_roots.append(cert_value)
-            
-            file_attrib_refs = []
-            for ref in signer.findall("ns:FileAttribRef", namespaces):
-                rule_id = ref.get("RuleID", "")
-                if rule_id:
-                    file_attrib_refs.append(rule_id)
-            
-            if cert_roots:
-                signer_info.append({
-                    'cert_roots': cert_roots,
-                    'file_attrib_refs': file_attrib_refs
-                })
+            file_name = elem.get("FileName")
+            max_version = elem.get("MaximumFileVersion")
+            if file_name and max_version:
+                # Parse once here as (fast tuple, Version); None marks an
+                # unparseable maximum
+                try:
+                    parsed_max = (fast_version(max_version), version.parse(max_version))
+                except version.InvalidVersion:
+                    parsed_max = None
+                deny_file_versions[file_name.lower()] = parsed_max
 
-    # Collect file attribute rules
-    file_attribs = {}
-    if file_rules is not None:
-        for attrib in file_rules.findall("ns:FileAttrib", namespaces):
-            file_name = attrib.get("FileName", "").lower()
-            rule_id = attrib.get("ID", "")
+        elif tag == FILE_ATTRIB_TAG:
+            # Collect file attribute rules
+            file_name = elem.get("FileName")
+            rule_id = elem.get("ID")
             if file_name and rule_id:
-                file_attribs[file_name] = rule_id
+                file_attribs[file_name.lower()] = rule_id
+
+        else:
+            # Index signers by cert root hash -> file attrib refs; an empty
+            # set of refs means the signer blocks anything it signed
+            cert_roots = set()
+            file_attrib_refs = set()
+            for child in elem:
+                child_tag = child.tag
+                if child_tag == CERT_ROOT_TAG:
+                    cert_value = child.get("Value")
+                    if cert_value:
+                        cert_roots.add(cert_value.lower())
+                elif child_tag == FILE_ATTRIB_REF_TAG:
+                    rule_id = child.get("RuleID")
+                    if rule_id:
+                        file_attrib_refs.add(rule_id)
+
+            file_attrib_refs = frozenset(file_attrib_refs)
+            for cert_value in cert_roots:
+                cert_index.setdefault(cert_value, []).append(file_attrib_refs)
 
-    return deny_hashes, deny_file_versions, signer_info, file_attribs
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+    return deny_hashes, deny_file_versions, cert_index, file_attribs
 
 def has_blocked_hash(driver, deny_hashes):
-    hashes_to_check = set()
-    
-    # Add direct hashes
-    for hash_type in ['MD5', 'SHA1', 'SHA256']:
-        h = driver.get(hash_type, "").lower()
-        if h:
-            hashes_to_check.add(h)
-    
-    # Add authenticode hashes
-    if "Authentihash" in driver:
-        auth_hash = driver["Authentihash"]
-        for hash_type in ['MD5', 'SHA1', 'SHA256']:
-            h = auth_hash.get(hash_type, "").lower()
-            if h:
-                hashes_to_check.add(h)
-    
-    return len(hashes_to_check & deny_hashes) > 0
+    return not deny_hashes.isdisjoint(driver['_hashes_lower'])
 
 def has_blocked_version(driver, deny_file_versions, file_attribs):
-    original_filename = driver.get("OriginalFilename", "").lower()
+    original_filename = driver['_orig_fn_lower']
     if not original_filename:
         return False
     
-    max_version = deny_file_versions.get(original_filename)
-    if not max_version:
+    parsed_max = deny_file_versions.get(original_filename)
+    if parsed_max is None:
         return False
+    max_tuple, max_version = parsed_max
     
     driver_version = driver.get("FileVersion", "")
     if not driver_version:
         return False
     
+    version_parts = driver_version.replace(',', '.').split()
+    clean_version = version_parts[0] if version_parts else ""
+    if not clean_version:
+        return False
+    
+    # Dotted integers on both sides compare as tuples, skipping PEP 440 parsing
+    if max_tuple is not None:
+        driver_tuple = fast_version(clean_version)
+        if driver_tuple is not None:
+            return driver_tuple <= max_tuple
+    
     try:
-        version_parts = driver_version.replace(',', '.').split()
-        clean_version = version_parts[0] if version_parts else ""
-        
-        if clean_version and version.parse(clean_version) <= version.parse(max_version):
+        if parse_version(clean_version) <= max_version:
             return True
     except version.InvalidVersion:
         pass
     
     return False
 
-def has_blocked_signer(driver, signer_info, file_attribs):
-    if "Signatures" not in driver:
+def has_blocked_signer(driver, cert_index, file_attribs):
+    matched = cert_index.keys() & driver['_cert_hashes']
+    if not matched:
         return False
     
-    original_filename = driver.get("OriginalFilename", "").lower()
+    original_filename = driver['_orig_fn_lower']
     file_attrib_id = file_attribs.get(original_filename) if original_filename else None
     
-    for sig in driver["Signatures"]:
-        if "Certificates" not in sig:
-            continue
-            
-        for cert in sig["Certificates"]:
-            if "TBS" not in cert:
-                continue
-                
-            tbs = cert["TBS"]
-            for hash_type in ["MD5", "SHA1", "SHA256", "SHA384"]:
-                if hash_type not in tbs:
-                    continue
-                    
-                cert_hash = tbs[hash_type].lower()
-                for signer in signer_info:
-                    if cert_hash in signer['cert_roots']:
-                        if (not signer['file_attrib_refs'] or 
-                            (file_attrib_id and file_attrib_id in signer['file_attrib_refs'])):
-                            return True
+    for cert_hash in matched:
+        for refs in cert_index[cert_hash]:
+            if not refs or (file_attrib_id and file_attrib_id in refs):
+                return True
     return False
 
-def generate_json_results(loldrivers, deny_hashes, deny_file_versions, signer_info, file_attribs):
-    """Generate JSON output of the analysis results."""
-    results = {
-        "summary": {
-            "total_drivers": len(loldrivers),
-            "blocked_count": 0,
-            "allowed_count": 0
-        },
-        "allowed_drivers": [],
-        "blocked_drivers": []
-    }
-    
+def is_blocked(driver, deny_hashes, deny_file_versions, cert_index, file_attribs):
+    return (has_blocked_hash(driver, deny_hashes) or 
+            has_blocked_version(driver, deny_file_versions, file_attribs) or 
+            has_blocked_signer(driver, cert_index, file_attribs))
+
+def classify_drivers(loldrivers, policy):
+    """Split drivers into (allowed, blocked) lists against a loaded policy."""
+    allowed = []
+    blocked = []
     for driver in loldrivers:
-        parent_info = driver.get('_parent_driver', {})
-        driver_id = parent_info.get('Id', '')
-        driver_link = f"https://www.loldrivers.io/drivers/{driver_id}" if driver_id else "N/A"
-        
-        filename = driver.get('Filename') or ''.join(parent_info.get('Tags', []))
-        
-        driver_info = {
-            "filename": filename if filename else "Unknown",
-            "driver_id": driver_id,
-            "driver_link": driver_link,
-            "md5": driver.get('MD5'),
-            "sha1": driver.get('SHA1'),
-            "sha256": driver.get('SHA256'),
-            "file_version": driver.get('FileVersion'),
-            "original_filename": driver.get('OriginalFilename'),
-            "parent_tags": parent_info.get('Tags', [])
-        }
-        
-        # Check if driver is blocked
-        is_blocked = (has_blocked_hash(driver, deny_hashes) or 
-                     has_blocked_version(driver, deny_file_versions, file_attribs) or 
-                     has_blocked_signer(driver, signer_info, file_attribs))
-        
-        if is_blocked:
-            results["summary"]["blocked_count"] += 1
-            results["blocked_drivers"].append(driver_info)
+        if is_blocked(driver, *policy):
+            blocked.append(driver)
         else:
-            results["summary"]["allowed_count"] += 1
-            results["allowed_drivers"].append(driver_info)
+            allowed.append(driver)
+    
+    return allowed, blocked
+
+def to_record(driver):
+    """Build the JSON record emitted for a single driver."""
+    parent_info = driver.get('_parent_driver', {})
+    driver_id = parent_info.get('Id', '')
+    driver_link = f"https://www.loldrivers.io/drivers/{driver_id}" if driver_id else "N/A"
+    
+    filename = driver.get('Filename') or ''.join(parent_info.get('Tags', []))
+    filename = filename if filename else "Unknown"
     
-    return results
+    md5 = driver.get('MD5')
+    sha1 = driver.get('SHA1')
+    sha256 = driver.get('SHA256')
+    
+    # Same identity compare_hvci.py derives, computed once at emit time
+    if sha256:
+        signature = f"sha256:{sha256.lower()}"
+    elif sha1:
+        signature = f"sha1:{sha1.lower()}"
+    elif md5:
+        signature = f"md5:{md5.lower()}"
+    else:
+        signature = f"file:{filename}_{driver_id}"
+    
+    return {
+        "filename": filename,
+        "driver_id": driver_id,
+        "driver_link": driver_link,
+        "md5": md5,
+        "sha1": sha1,
+        "sha256": sha256,
+        "file_version": driver.get('FileVersion'),
+        "original_filename": driver.get('OriginalFilename'),
+        "parent_tags": parent_info.get('Tags', []),
+        "signature": signature,
+        "hash_any": sha256 or sha1 or md5 or None
+    }
+
+def stream_results(path, allowed, blocked):
+    """Write the results JSON one record at a time and return its summary."""
+    summary = {
+        "total_drivers": len(allowed) + len(blocked),
+        "blocked_count": len(blocked),
+        "allowed_count": len(allowed)
+    }
+    
+    # Same layout as dumping the whole results dict with indent=2, but only
+    # a single driver record is ever materialized
+    with open(path, 'wb') as f:
+        f.write(b'{\n  "summary": ' + dumps(summary).replace(b'\n', b'\n  '))
+        for key, drivers in ((b"allowed_drivers", allowed), (b"blocked_drivers", blocked)):
+            f.write(b',\n  "' + key + b'": [')
+            separator = b'\n    '
+            for driver in drivers:
+                f.write(separator + dumps(to_record(driver)).replace(b'\n', b'\n    '))
+                separator = b',\n    '
+            f.write(b'\n  ]' if drivers else b']')
+        f.write(b'\n}')
+    
+    return summary
 
 def print_driver(driver):
     parent_info = driver.get('_parent_driver', {})
@@ -242,41 +312,29 @@ def main(xml_path, json_output=False):
         )
 
     loldrivers = load_loldrivers()
-    deny_hashes, deny_file_versions, signer_info, file_attribs = load_policy(xml_path)
+    policy = load_policy(xml_path)
+    allowed, blocked = classify_drivers(loldrivers, policy)
     
     if json_output:
-        # Generate and output JSON results
-        results = generate_json_results(loldrivers, deny_hashes, deny_file_versions, signer_info, file_attribs)
-        
-        # Save JSON to file
-        import os
         from datetime import datetime
         
         # Create filename with timestamp
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"byovd_finder_results_{timestamp}.json"
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        # Stream JSON results to file
+        summary = stream_results(filename, allowed, blocked)
         
         print(f"Results saved to: {filename}")
-        print(f"Summary: {results['summary']['allowed_count']} allowed, {results['summary']['blocked_count']} blocked out of {results['summary']['total_drivers']} total drivers")
+        print(f"Summary: {summary['allowed_count']} allowed, {summary['blocked_count']} blocked out of {summary['total_drivers']} total drivers")
     else:
         # Original console output
-        blocked_count = 0
-        allowed_count = 0
-        for driver in loldrivers:
-            if (has_blocked_hash(driver, deny_hashes) or 
-                has_blocked_version(driver, deny_file_versions, file_attribs) or 
-                has_blocked_signer(driver, signer_info, file_attribs)):
-                blocked_count += 1
-            else:
-                allowed_count += 1
-                print_driver(driver)
+        for driver in allowed:
+            print_driver(driver)
         
         print()
-        print(Fore.MAGENTA + f"[+] Number of Blocked Drivers: {blocked_count}")
-        print(Fore.MAGENTA + f"[+] Number of Allowed Drivers: {allowed_count}")
+        print(Fore.MAGENTA + f"[+] Number of Blocked Drivers: {len(blocked)}")
+        print(Fore.MAGENTA + f"[+] Number of Allowed Drivers: {len(allowed)}")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Check allowed drivers against the HVCI block list.")
@@ -13,12 +13,12 @@ import json
 import sys
 from datetime import datetime
 from typing import Dict, List, Set
+from _jsonio import read_json, write_json
 
 def load_json_file(file_path: str) -> Dict:
     """Load and validate JSON file."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = read_json(file_path)
         
         # Validate expected structure
         required_keys = ['summary', 'allowed_drivers', 'blocked_drivers']
@@ -50,11 +50,19 @@ def get_driver_signature(driver: Dict) -> str:
         # Fallback to filename + driver_id combination
         return f"file:{driver.get('filename', 'unknown')}_{driver.get('driver_id', 'unknown')}"
 
+def get_driver_hash(driver: Dict) -> str:
+    """Return the best available hash for a driver, preferring SHA256."""
+    # Short-circuit on the precomputed field, older results lack it
+    return (driver.get('hash_any') or driver.get('sha256') or
+            driver.get('sha1') or driver.get('md5') or 'N/A')
+
 def create_driver_map(drivers: List[Dict]) -> Dict[str, Dict]:
     """Create a mapping of driver signatures to driver data."""
     driver_map = {}
+    get_signature = get_driver_signature
     for driver in drivers:
-        signature = get_driver_signature(driver)
+        # Results written by newer byovd.py carry a precomputed signature
+        signature = driver.get('signature') or get_signature(driver)
         driver_map[signature] = driver
     return driver_map
 
@@ -67,47 +75,43 @@ def compare_drivers(old_data: Dict, new_data: Dict) -> Dict:
     new_allowed_map = create_driver_map(new_data['allowed_drivers'])
     new_blocked_map = create_driver_map(new_data['blocked_drivers'])
     
-    # Find drivers that were in old but not in new
-    old_all_drivers = {**old_allowed_map, **old_blocked_map}
-    new_all_drivers = {**new_allowed_map, **new_blocked_map}
+    # Compare signature sets through key views so the maps are never merged
+    old_signatures = old_allowed_map.keys() | old_blocked_map.keys()
+    new_signatures = new_allowed_map.keys() | new_blocked_map.keys()
     
-    removed_signatures = set(old_all_drivers.keys()) - set(new_all_drivers.keys())
-    added_signatures = set(new_all_drivers.keys()) - set(old_all_drivers.keys())
+    removed_signatures = old_signatures - new_signatures
+    added_signatures = new_signatures - old_signatures
     
     # Categorize removed drivers
     removed_allowed = []
     removed_blocked = []
     
     for signature in removed_signatures:
-        driver = old_all_drivers[signature]
         if signature in old_allowed_map:
-            removed_allowed.append(driver)
+            removed_allowed.append(old_allowed_map[signature])
         else:
-            removed_blocked.append(driver)
+            removed_blocked.append(old_blocked_map[signature])
     
     # Categorize added drivers
     added_allowed = []
     added_blocked = []
     
     for signature in added_signatures:
-        driver = new_all_drivers[signature]
         if signature in new_allowed_map:
-            added_allowed.append(driver)
+            added_allowed.append(new_allowed_map[signature])
         else:
-            added_blocked.append(driver)
+            added_blocked.append(new_blocked_map[signature])
     
     # Check for status changes (allowed -> blocked or blocked -> allowed)
     status_changes = []
-    common_signatures = set(old_all_drivers.keys()) & set(new_all_drivers.keys())
+    common_signatures = old_signatures & new_signatures
     
     for signature in common_signatures:
-        old_driver = old_all_drivers[signature]
-        new_driver = new_all_drivers[signature]
-        
         old_was_allowed = signature in old_allowed_map
         new_is_allowed = signature in new_allowed_map
         
         if old_was_allowed != new_is_allowed:
+            new_driver = new_allowed_map[signature] if new_is_allowed else new_blocked_map[signature]
             status_changes.append({
                 'driver': new_driver,
                 'old_status': 'allowed' if old_was_allowed else 'blocked',
@@ -176,6 +180,13 @@ def extract_date_from_filename(filename: str) -> str:
     # Fallback to current date
     return datetime.now().strftime("%d-%m-%Y")
 
+def changelog_sort_key(entry: Dict) -> datetime:
+    """Sort key for changelog entries, whose dates are DD-MM-YYYY strings."""
+    try:
+        return datetime.strptime(entry['date'], "%d-%m-%Y")
+    except (KeyError, ValueError):
+        return datetime.min
+
 def format_changes_for_changelog(comparison: Dict) -> Dict:
     """Format changes for the simple changelog structure."""
     changes = {
@@ -188,7 +199,7 @@ def format_changes_for_changelog(comparison: Dict) -> Dict:
     for driver in comparison['removed_allowed'] + comparison['removed_blocked']:
         changes["removed"].append({
             "name": driver.get('filename', 'Unknown'),
-            "hash": driver.get('sha256', driver.get('sha1', driver.get('md5', 'N/A'))),
+            "hash": get_driver_hash(driver),
             "driver_id": driver.get('driver_id', 'N/A')
         })
     
@@ -196,7 +207,7 @@ def format_changes_for_changelog(comparison: Dict) -> Dict:
     for driver in comparison['added_allowed'] + comparison['added_blocked']:
         changes["added"].append({
             "name": driver.get('filename', 'Unknown'),
-            "hash": driver.get('sha256', driver.get('sha1', driver.get('md5', 'N/A'))),
+            "hash": get_driver_hash(driver),
             "driver_id": driver.get('driver_id', 'N/A')
         })
     
@@ -205,7 +216,7 @@ def format_changes_for_changelog(comparison: Dict) -> Dict:
         driver = change['driver']
         changes["status_changes"].append({
             "name": driver.get('filename', 'Unknown'),
-            "hash": driver.get('sha256', driver.get('sha1', driver.get('md5', 'N/A'))),
+            "hash": get_driver_hash(driver),
             "driver_id": driver.get('driver_id', 'N/A'),
             "old_status": change['old_status'],
             "new_status": change['new_status']
@@ -216,8 +227,7 @@ def format_changes_for_changelog(comparison: Dict) -> Dict:
 def load_existing_changelog(changelog_file: str) -> Dict:
     """Load existing changelog file or create new structure."""
     try:
-        with open(changelog_file, 'r', encoding='utf-8') as f:
-            existing_changelog = json.load(f)
+        existing_changelog = read_json(changelog_file)
         
         # Validate structure
         if not isinstance(existing_changelog, list):
@@ -260,12 +270,12 @@ def save_changelog(comparison: Dict, old_file: str, new_file: str, output_file:
         "data": changes
     }
     
-    # Add to changelog
+    # Add to changelog, keeping the file in chronological order
     existing_changelog.append(new_entry)
+    existing_changelog.sort(key=changelog_sort_key)
     
     # Save updated changelog
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(existing_changelog, f, indent=2, ensure_ascii=False)
+    write_json(output_file, existing_changelog)
     
     return output_file
 
@@ -319,8 +329,7 @@ def print_summary(comparison: Dict):
 def display_changelog_history(changelog_file: str = "byovd_changelog.json"):
     """Display changelog history in a format suitable for website display."""
     try:
-        with open(changelog_file, 'r', encoding='utf-8') as f:
-            changelog = json.load(f)
+        changelog = read_json(changelog_file)
         
         if not changelog:
             print("No changelog history found.")
@@ -330,8 +339,8 @@ def display_changelog_history(changelog_file: str = "byovd_changelog.json"):
         print("BYOVDFinder Changelog History")
         print("="*80)
         
-        # Sort by date (newest first)
-        changelog.sort(key=lambda x: x['date'], reverse=True)
+        # Sort by date (newest first); string order would misplace DD-MM-YYYY
+        changelog.sort(key=changelog_sort_key, reverse=True)
         
         for entry in changelog:
             print(f"\nChangeLog {entry['date']}:")
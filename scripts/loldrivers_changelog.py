@@ -4,31 +4,22 @@
 Script to detect new drivers added to loldrivers.io and update the changelog.
 """
 import os
-import json
-import requests
 from datetime import datetime
+from _http import fetch_loldrivers
+from _jsonio import read_json, write_json
 
-LOLDIVERS_URL = "https://www.loldrivers.io/api/drivers.json"
 PREVIOUS_PATH = os.path.join("data", "jsons", "loldrivers_previous.json")
 CHANGELOG_PATH = os.path.join("data", "jsons", "byovd_changelog.json")
 
 
-def fetch_loldrivers():
-    resp = requests.get(LOLDIVERS_URL)
-    resp.raise_for_status()
-    return resp.json()
-
-
 def load_json(path):
     if not os.path.exists(path):
         return None
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return read_json(path)
 
 
 def save_json(path, data):
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    write_json(path, data)
 
 
 def get_driver_key(driver):
@@ -36,12 +27,23 @@ def get_driver_key(driver):
     if "Id" in driver:
         return driver["Id"]
     # fallback: try to get a unique hash
-    for h in ["SHA256", "sha256", "SHA1", "sha1", "MD5", "md5"]:
-        if h in driver and driver[h]:
-            return driver[h]
+    driver_get = driver.get
+    for h in ("SHA256", "sha256", "SHA1", "sha1", "MD5", "md5"):
+        value = driver_get(h)
+        if value:
+            return value
     return None
 
 
+def get_driver_hash(driver):
+    driver_get = driver.get
+    return (
+        driver_get("SHA256") or driver_get("sha256") or
+        driver_get("SHA1") or driver_get("sha1") or
+        driver_get("MD5") or driver_get("md5")
+    )
+
+
 def main():
     latest = fetch_loldrivers()
     previous = load_json(PREVIOUS_PATH)
@@ -50,7 +52,7 @@ def main():
         save_json(PREVIOUS_PATH, latest)
         return
 
-    prev_keys = set(get_driver_key(d) for d in previous if get_driver_key(d))
+    prev_keys = {k for d in previous if (k := get_driver_key(d))}
     new_drivers = [d for d in latest if get_driver_key(d) not in prev_keys]
 
     if not new_drivers:
@@ -79,18 +81,9 @@ def main():
         else:
             name = get_driver_key(driver)
         # Try to get a hash
-        hashval = (
-            driver.get("SHA256") or driver.get("sha256") or
-            driver.get("SHA1") or driver.get("sha1") or
-            driver.get("MD5") or driver.get("md5")
-        )
+        hashval = get_driver_hash(driver)
         if not hashval and "KnownVulnerableSamples" in driver and driver["KnownVulnerableSamples"]:
-            sample = driver["KnownVulnerableSamples"][0]
-            hashval = (
-                sample.get("SHA256") or sample.get("sha256") or
-                sample.get("SHA1") or sample.get("sha1") or
-                sample.get("MD5") or sample.get("md5")
-            )
+            hashval = get_driver_hash(driver["KnownVulnerableSamples"][0])
         entry["data"]["added"].append({
             "name": name,
             "hash": hashval,